@@ -0,0 +1,322 @@
+"""
+Batch Chat with MCP Tools
+
+This module runs many independent, non-interactive chats through the OpenAI
+Batch API, executing any requested MCP tools between batch rounds.
+"""
+
+import asyncio
+import json
+import sys
+from typing import Any, Dict, List
+
+import orjson
+
+# The Batch API only offers a 24 hour completion window
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_COMPLETION_WINDOW_MS = 24 * 60 * 60 * 1000
+
+# Seconds between batch status checks, doubling up to the maximum
+POLL_INITIAL_DELAY = 10
+POLL_MAX_DELAY = 300
+
+# Rounds of tool calls allowed per chat before forcing a final answer
+MAX_TOOL_ROUNDS = 5
+
+# Fields of an assistant message that are sent back in the next round
+ASSISTANT_MESSAGE_FIELDS = ("role", "content", "tool_calls")
+
+BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+async def run_batch(
+    client: Any,
+    model: str,
+    tools: List[Dict[str, Any]] | None,
+    tool_executor: Any,
+    inputs: List[str],
+    latency_budget_ms: int | None = None,
+) -> List[str | None]:
+    """
+    Run one independent chat per input and return each final answer.
+
+    Every round submits all unfinished chats together; chats that asked for
+    tools get their tool results appended and go into the next round. Batch
+    jobs can take up to the full completion window, so when a latency
+    budget shorter than that is given the rounds go to the real-time
+    endpoint instead.
+
+    Args:
+        client: AsyncOpenAI client
+        model: OpenAI model to use
+        tools: Tool definitions in OpenAI format, or None
+        tool_executor: MCPToolExecutor used to run requested tools
+        inputs: One user message per chat
+        latency_budget_ms: Optional bound on how long the caller can wait
+
+    Returns:
+        The final assistant content for each input, or None if it failed
+    """
+    if latency_budget_ms is not None and latency_budget_ms < BATCH_COMPLETION_WINDOW_MS:
+        complete = _complete_realtime
+    else:
+        complete = _complete_batch
+
+    conversations = [[{"role": "user", "content": text}] for text in inputs]
+    results: List[str | None] = [None] * len(inputs)
+    pending = list(range(len(inputs)))
+
+    for round_index in range(MAX_TOOL_ROUNDS + 1):
+        if not pending:
+            break
+
+        # On the last round leave tools out so every chat has to answer
+        round_tools = tools if round_index < MAX_TOOL_ROUNDS else None
+        try:
+            responses = await complete(
+                client,
+                model,
+                {i: conversations[i] for i in pending},
+                round_tools,
+            )
+        except Exception as e:
+            # Only this round's chats fail; answers from earlier rounds stand
+            print(
+                f"Warning: Round {round_index + 1} failed for {len(pending)} chats: {e}",
+                file=sys.stderr,
+            )
+            responses = {}
+
+        needs_tools = []
+        for i, message in responses.items():
+            conversations[i].append(message)
+            if message.get("tool_calls"):
+                needs_tools.append(i)
+            else:
+                results[i] = message.get("content")
+
+        # Run the tools for every chat at once; the executor's cache and
+        # shared sessions dedupe calls repeated across chats
+        await asyncio.gather(
+            *(_run_tool_calls(tool_executor, conversations[i]) for i in needs_tools)
+        )
+        pending = needs_tools
+
+    return results
+
+
+def _request_body(
+    model: str,
+    messages: List[Dict[str, Any]],
+    tools: List[Dict[str, Any]] | None,
+) -> Dict[str, Any]:
+    """Build a chat completions request body."""
+    body = {"model": model, "messages": messages}
+    if tools:
+        body["tools"] = tools
+        body["tool_choice"] = "auto"
+    return body
+
+
+def _assistant_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the assistant message fields the API accepts back."""
+    return {
+        key: message[key]
+        for key in ASSISTANT_MESSAGE_FIELDS
+        if message.get(key) is not None
+    }
+
+
+async def _complete_realtime(
+    client: Any,
+    model: str,
+    conversations: Dict[int, List[Dict[str, Any]]],
+    tools: List[Dict[str, Any]] | None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Complete each conversation concurrently on the real-time endpoint.
+
+    Returns:
+        Assistant message for each conversation that succeeded, by index
+    """
+
+    async def _complete(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        response = await client.chat.completions.create(
+            **_request_body(model, messages, tools)
+        )
+        return _assistant_message(response.choices[0].message.model_dump())
+
+    indexes = list(conversations)
+    responses = await asyncio.gather(
+        *(_complete(conversations[i]) for i in indexes), return_exceptions=True
+    )
+
+    messages = {}
+    for i, response in zip(indexes, responses):
+        if isinstance(response, BaseException):
+            print(f"Warning: Request req-{i} failed: {response}", file=sys.stderr)
+            continue
+        messages[i] = response
+    return messages
+
+
+async def _complete_batch(
+    client: Any,
+    model: str,
+    conversations: Dict[int, List[Dict[str, Any]]],
+    tools: List[Dict[str, Any]] | None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Complete all conversations as a single Batch API job.
+
+    Returns:
+        Assistant message for each conversation that succeeded, by index
+    """
+    lines = [
+        orjson.dumps(
+            {
+                "custom_id": f"req-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _request_body(model, messages, tools),
+            }
+        )
+        for i, messages in conversations.items()
+    ]
+    input_file = await client.files.create(
+        file=("batch.jsonl", b"\n".join(lines)), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window=BATCH_COMPLETION_WINDOW,
+    )
+
+    # Poll with exponential backoff; batches take minutes to hours
+    delay = POLL_INITIAL_DELAY
+    while batch.status not in BATCH_TERMINAL_STATUSES:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, POLL_MAX_DELAY)
+        batch = await client.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        if counts:
+            print(
+                f"Batch {batch.id}: {batch.status} ({counts.completed}/{counts.total})",
+                file=sys.stderr,
+            )
+
+    if batch.status != "completed":
+        print(
+            f"Warning: Batch {batch.id} {batch.status}: {batch.errors or 'no details'}",
+            file=sys.stderr,
+        )
+
+    # Expired or cancelled batches may still have partial output; requests
+    # that failed outright are only listed in the error file
+    messages = {}
+    if batch.output_file_id:
+        output = await client.files.content(batch.output_file_id)
+        for result in _batch_results(output.text):
+            custom_id = result.get("custom_id", "")
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                _warn_failed_request(result)
+                continue
+            message = response["body"]["choices"][0]["message"]
+            messages[int(custom_id.removeprefix("req-"))] = _assistant_message(message)
+
+    if batch.error_file_id:
+        errors = await client.files.content(batch.error_file_id)
+        for result in _batch_results(errors.text):
+            _warn_failed_request(result)
+
+    return messages
+
+
+def _batch_results(text: str) -> List[Dict[str, Any]]:
+    """Parse a batch output or error file into one result per request."""
+    return [orjson.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _warn_failed_request(result: Dict[str, Any]):
+    """Report a request from a batch output or error file that failed."""
+    response = result.get("response") or {}
+    error = result.get("error") or response.get("body") or response
+    print(
+        f"Warning: Request {result.get('custom_id', '')} failed: {error}",
+        file=sys.stderr,
+    )
+
+
+async def _run_tool_calls(tool_executor: Any, conversation: List[Dict[str, Any]]):
+    """
+    Execute the tool calls in a conversation's last message concurrently.
+
+    Tool results are appended in tool_calls order so each tool_call_id
+    lines up with its request.
+
+    Args:
+        tool_executor: MCPToolExecutor used to run the tools
+        conversation: Messages ending with an assistant tool_calls message
+    """
+
+    async def _call(tool_call: Dict[str, Any]) -> str:
+        function = tool_call["function"]
+        try:
+            arguments = tool_executor.parse_arguments(function["arguments"])
+        except json.JSONDecodeError as e:
+            return tool_executor.error_result(
+                "invalid_arguments", str(e), retryable=True
+            )
+        return await tool_executor.execute_tool(function["name"], arguments)
+
+    tool_calls = conversation[-1]["tool_calls"]
+    results = await asyncio.gather(*(_call(tool_call) for tool_call in tool_calls))
+    for tool_call, result in zip(tool_calls, results):
+        conversation.append(
+            {"role": "tool", "tool_call_id": tool_call["id"], "content": result}
+        )
+
+
+async def main():
+    """Main entry point for the batch program."""
+    if len(sys.argv) < 3:
+        print("Usage: python batchwithtools.py <path_to_mcp.json> <inputs.txt> [model]")
+        print("  inputs.txt: One user message per line")
+        print("  model: Optional OpenAI model (default: gpt-4o)")
+        sys.exit(1)
+
+    # Imported here because chatwithtools imports this module
+    from chatwithtools import ChatSession
+
+    config_path = sys.argv[1]
+    inputs_path = sys.argv[2]
+    model = sys.argv[3] if len(sys.argv) > 3 else "gpt-4o"
+
+    try:
+        with open(inputs_path, "r") as f:
+            inputs = [line.strip() for line in f if line.strip()]
+
+        chat = ChatSession(config_path, model)
+        try:
+            results = await chat.batch_run(inputs)
+        finally:
+            await chat.aclose()
+
+        # One JSON object per line, in input order
+        for text, result in zip(inputs, results):
+            print(orjson.dumps({"input": text, "output": result}).decode())
+
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,63 +5,217 @@ This module provides an interactive chat session using OpenAI that can call MCP
 """
 
 import asyncio
+import contextlib
+import hashlib
+import io
 import json
 import os
 import shutil
 import sys
+import tempfile
 import textwrap
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List
 
+import aioconsole
+import anyio
+import httpx
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
 
-from get_mcp_tools import get_tools
+from batchwithtools import run_batch
+from get_mcp_tools import get_startup_timeout, get_tools
 
 load_dotenv(override=True)
 
+# Top-level JSON Schema keywords that describe the schema document itself
+# rather than the arguments, and are dropped before sending to OpenAI
+UNSUPPORTED_SCHEMA_KEYS = frozenset({"$schema", "$id"})
+
+# Bumped whenever the cached tool catalog format changes, so stale caches
+# written by an older version are ignored rather than loaded
+TOOL_CACHE_VERSION = 2
+
 
 class MCPToolExecutor:
     """Manages MCP server connections and tool execution."""
 
-    def __init__(self, config_path: str):
+    def __init__(
+        self, config_path: str, cache_size: int = 512, cache_ttl: float = 60.0
+    ):
         """
         Initialize the MCP tool executor.
 
         Args:
             config_path: Path to the mcp.json configuration file
+            cache_size: Maximum number of tool results kept in the cache
+            cache_ttl: Seconds a cached tool result stays valid
         """
         self.config_path = config_path
+        self.config_hash = None  # sha256 of mcp.json, keys the tool cache
         self.config = self._load_config()
         self.tool_to_server = {}  # Maps tool names to server names
 
+        # Long-lived sessions, one per server, kept open for the whole chat
+        # so each tool call is a single RPC instead of a spawn + handshake.
+        # Each entry is a future resolving to the server's initialized
+        # session, so callers arriving mid-connect share the same one.
+        self._sessions: Dict[str, asyncio.Future] = {}
+        self._session_tasks: Dict[str, asyncio.Task] = {}
+        self._closing = asyncio.Event()
+
+        # LRU cache of tool results keyed by (tool name, canonical args) so a
+        # repeated query is answered without another round-trip. Values are
+        # (expiry time, result). Identical calls already in flight share one
+        # task instead of each dispatching their own RPC.
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: OrderedDict[tuple[str, str], tuple[float, str]] = (
+            OrderedDict()
+        )
+        self._inflight: Dict[tuple[str, str], asyncio.Task] = {}
+
     def _load_config(self) -> Dict[str, Any]:
         """Load the MCP configuration file."""
         config_file = Path(self.config_path)
         if not config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
 
-        with open(config_file, "r") as f:
-            return json.load(f)
+        content = config_file.read_bytes()
+        self.config_hash = hashlib.sha256(content).hexdigest()
+        return orjson.loads(content)
+
+    def _tool_cache_path(self) -> Path:
+        """Return the tool catalog cache file for the current mcp.json."""
+        cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        file_name = f"{self.config_hash}.v{TOOL_CACHE_VERSION}.json"
+        return Path(cache_home) / "mcp-chatwithtools" / file_name
+
+    def _load_tool_cache(self) -> Dict[str, Any] | None:
+        """
+        Load the cached tool catalog, if one exists for this mcp.json.
+
+        Returns:
+            Dictionary with "tools" and "tool_to_server", or None on a miss
+        """
+        cache_path = self._tool_cache_path()
+        try:
+            cached = orjson.loads(cache_path.read_bytes())
+            return {
+                "tools": cached["tools"],
+                "tool_to_server": cached["tool_to_server"],
+            }
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # A corrupt or unreadable cache just means rediscovering tools
+            print(f"Warning: Ignoring tool cache {cache_path}: {e}", file=sys.stderr)
+            return None
+
+    def _save_tool_cache(self, openai_tools: List[Dict[str, Any]]):
+        """Write the tool catalog to the cache file atomically."""
+        cache_path = self._tool_cache_path()
+        tmp_name = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so a crash never leaves a partial
+            # cache behind for the next start to load
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=cache_path.parent, suffix=".tmp", delete=False
+            ) as f:
+                tmp_name = f.name
+                f.write(
+                    orjson.dumps(
+                        {"tools": openai_tools, "tool_to_server": self.tool_to_server}
+                    )
+                )
+            os.replace(tmp_name, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not write tool cache: {e}", file=sys.stderr)
+            # Don't leave a stray temp file behind on every failed write
+            if tmp_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
 
-    async def initialize_tools(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _normalize_schema(schema: Any) -> Dict[str, Any]:
+        """
+        Normalize an MCP inputSchema into OpenAI function parameters.
+
+        Drops document-level keywords, defaults a missing type to "object",
+        and forbids unlisted arguments when the schema names its properties.
+        Any schema OpenAI would reject raises instead, so the problem shows
+        up at startup and the tool can be skipped.
+
+        Args:
+            schema: The inputSchema reported by the MCP server
+
+        Returns:
+            A new parameters dictionary
+
+        Raises:
+            ValueError: If the schema is not an object schema
+        """
+        if not isinstance(schema, dict):
+            raise ValueError("inputSchema must be a JSON object")
+
+        parameters = {
+            key: value
+            for key, value in schema.items()
+            if key not in UNSUPPORTED_SCHEMA_KEYS
+        }
+        schema_type = parameters.setdefault("type", "object")
+        if schema_type != "object":
+            raise ValueError(f"inputSchema type must be 'object', not {schema_type!r}")
+
+        properties = parameters.setdefault("properties", {})
+        if not isinstance(properties, dict):
+            raise ValueError("inputSchema properties must be a JSON object")
+
+        # Only when properties are listed: an empty schema means free-form
+        if properties and "additionalProperties" not in parameters:
+            parameters["additionalProperties"] = False
+
+        return parameters
+
+    async def initialize_tools(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get all tools from configured MCP servers and format them for OpenAI.
 
+        The result is cached on disk keyed by a hash of mcp.json, so later
+        starts with an unchanged config skip launching every server just to
+        list its tools. Sessions are still opened lazily by execute_tool.
+
+        Args:
+            refresh: Ignore any cached catalog and rediscover tools
+
         Returns:
             List of tool definitions in OpenAI format
         """
+        if not refresh:
+            cached = self._load_tool_cache()
+            if cached is not None:
+                self.tool_to_server = cached["tool_to_server"]
+                return cached["tools"]
+
         # Get tools from all servers
-        server_tools = await get_tools(self.config_path)
+        server_tools = await get_tools(self.config)
 
         # Convert to OpenAI tool format
         openai_tools = []
+        had_errors = False
 
         for server_info in server_tools:
             if "error" in server_info:
+                had_errors = True
                 print(
                     f"Warning: Error from server {server_info.get('server', 'unknown')}: {server_info['error']}",
                     file=sys.stderr,
@@ -74,24 +228,38 @@ class MCPToolExecutor:
             for tool in tools:
                 tool_name = tool.get("name")
 
-                # Map tool name to server
-                self.tool_to_server[tool_name] = server_name
-
                 # Format for OpenAI
                 openai_tool = {
                     "type": "function",
                     "function": {
                         "name": tool_name,
-                        "description": tool.get("description", ""),
+                        "description": tool.get("description") or "",
                     },
                 }
 
-                # Add input schema if available
+                # Add input schema if available, normalized once here rather
+                # than surfacing as a rejected request on every later turn
                 if "inputSchema" in tool:
-                    openai_tool["function"]["parameters"] = tool["inputSchema"]
+                    try:
+                        parameters = self._normalize_schema(tool["inputSchema"])
+                    except ValueError as e:
+                        print(
+                            f"Warning: Skipping tool {tool_name} from server {server_name}: {e}",
+                            file=sys.stderr,
+                        )
+                        continue
+                    openai_tool["function"]["parameters"] = parameters
+
+                # Map tool name to server
+                self.tool_to_server[tool_name] = server_name
 
                 openai_tools.append(openai_tool)
 
+        # Don't cache a partial catalog, or a server that was down this time
+        # would stay missing on every later start
+        if not had_errors:
+            self._save_tool_cache(openai_tools)
+
         return openai_tools
 
     async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> str:
@@ -108,59 +276,412 @@ class MCPToolExecutor:
         # Find which server has this tool
         server_name = self.tool_to_server.get(tool_name)
         if not server_name:
-            return json.dumps({"error": f"Tool {tool_name} not found"})
+            return self.error_result("tool_not_found", f"Tool {tool_name} not found")
 
         # Get server configuration
         server_config = self.config.get("mcpServers", {}).get(server_name)
         if not server_config:
-            return json.dumps({"error": f"Server {server_name} not configured"})
-
-        async def _call_tool(session: ClientSession) -> str:
-            await session.initialize()
-            result = await session.call_tool(tool_name, arguments=arguments)
-            if hasattr(result, "content"):
-                content_items = []
-                for item in result.content:
-                    if hasattr(item, "text"):
-                        content_items.append(item.text)
-                    else:
-                        content_items.append(str(item))
-                return "\n".join(content_items)
+            return self.error_result(
+                "server_not_configured", f"Server {server_name} not configured"
+            )
+
+        try:
+            if not self._is_cacheable(tool_name, server_config):
+                result = await self._call_tool(
+                    server_name, server_config, tool_name, arguments
+                )
+                return self._format_result(result)
+
+            key = (tool_name, self._arguments_key(arguments))
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(
+                    self._call_and_cache(
+                        key, server_name, server_config, tool_name, arguments
+                    )
+                )
+                self._inflight[key] = task
+            # Shield so one cancelled caller doesn't cancel the shared call
+            return await asyncio.shield(task)
+
+        except Exception as e:
+            # Some exceptions, like anyio's ClosedResourceError, have no
+            # message; the type name still tells the model what went wrong
+            return self.error_result(
+                "tool_exception", str(e) or type(e).__name__, retryable=True
+            )
+
+    @staticmethod
+    def error_result(code: str, message: str, retryable: bool = False) -> str:
+        """
+        Format a tool error as a structured JSON tool result.
+
+        The code and retryable flag let the model, and ChatSession, tell an
+        error worth retrying (a dropped connection, bad arguments) from one
+        that will fail the same way every time (an unknown tool).
+
+        Args:
+            code: Short machine-readable error code
+            message: Human-readable description of the error
+            retryable: Whether calling again could succeed
+
+        Returns:
+            JSON string of the form {"error": {"code", "message", "retryable"}}
+        """
+        return orjson.dumps(
+            {"error": {"code": code, "message": message, "retryable": retryable}}
+        ).decode()
+
+    @staticmethod
+    def parse_arguments(text: str) -> Any:
+        """
+        Parse the JSON arguments of a tool call from the model.
+
+        Uses the standard json module rather than orjson: arguments are
+        small, and orjson turns integers beyond 64 bits into floats, which
+        would silently change the values tools receive.
+
+        Raises:
+            json.JSONDecodeError: If the arguments aren't valid JSON
+        """
+        return json.loads(text)
+
+    @staticmethod
+    def _arguments_key(arguments: Dict[str, Any]) -> str:
+        """Serialize tool arguments canonically for use in a cache key."""
+        try:
+            return orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS).decode()
+        except TypeError:
+            # orjson can't encode integers beyond 64 bits
+            return json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+
+    @staticmethod
+    def parse_error_result(content: str) -> Dict[str, Any] | None:
+        """
+        Return the error from a tool result made by error_result, if it is one.
+
+        Args:
+            content: A tool result string
+
+        Returns:
+            The error dictionary, or None if the result isn't a tool error
+        """
+        if not content.startswith('{"error":'):
+            return None
+        try:
+            error = orjson.loads(content)["error"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            return None
+        if not isinstance(error, dict) or "retryable" not in error:
+            return None
+        return error
+
+    async def _call_tool(
+        self,
+        server_name: str,
+        server_config: Dict[str, Any],
+        tool_name: str,
+        arguments: Dict[str, Any],
+    ) -> Any:
+        """
+        Call a tool over the server's persistent session.
+
+        A server that exited leaves its transport closed without raising
+        anything in its session task, so the first call to notice drops the
+        session and retries once on a fresh connection.
+        """
+        session = await self._get_session(server_name, server_config)
+        try:
+            return await session.call_tool(tool_name, arguments=arguments)
+        except Exception as e:
+            if not self._is_connection_closed(e):
+                raise
+        await self._evict_session(server_name, session)
+        session = await self._get_session(server_name, server_config)
+        return await session.call_tool(tool_name, arguments=arguments)
+
+    @staticmethod
+    def _is_connection_closed(error: Exception) -> bool:
+        """Check whether an error means the server connection is gone."""
+        if isinstance(error, (anyio.ClosedResourceError, anyio.BrokenResourceError)):
+            return True
+        return isinstance(error, McpError) and error.error.code == CONNECTION_CLOSED
+
+    async def _evict_session(self, server_name: str, session: ClientSession):
+        """
+        Drop a dead session so the next call reconnects.
+
+        Concurrent callers can notice the same dead session, so only the
+        first evicts it; later ones leave the replacement alone.
+
+        Args:
+            server_name: Name of the server
+            session: The session whose connection closed
+        """
+        ready = self._sessions.get(server_name)
+        if (
+            ready is None
+            or not ready.done()
+            or ready.cancelled()
+            or ready.exception() is not None
+            or ready.result() is not session
+        ):
+            return
+        del self._sessions[server_name]
+        task = self._session_tasks.pop(server_name)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def _call_and_cache(
+        self,
+        key: tuple[str, str],
+        server_name: str,
+        server_config: Dict[str, Any],
+        tool_name: str,
+        arguments: Dict[str, Any],
+    ) -> str:
+        """Call a tool and store its result in the cache unless it failed."""
+        try:
+            result = await self._call_tool(
+                server_name, server_config, tool_name, arguments
+            )
+        finally:
+            self._inflight.pop(key, None)
+
+        text = self._format_result(result)
+        # Tool-level errors may be transient, so don't pin them in the cache
+        if not getattr(result, "isError", False):
+            self._cache_put(key, text)
+        return text
+
+    @staticmethod
+    def _format_result(result: Any) -> str:
+        """Extract the text content from an MCP tool result."""
+        content = getattr(result, "content", None)
+        if content is None:
             return str(result)
+        # str.join still materializes the generator into a sequence; this only
+        # drops the explicit append loop
+        return "\n".join(
+            item.text if hasattr(item, "text") else str(item) for item in content
+        )
+
+    @staticmethod
+    def _is_cacheable(tool_name: str, server_config: Dict[str, Any]) -> bool:
+        """
+        Check whether results from a tool may be cached.
+
+        A server's "cacheable" setting in mcp.json is either a boolean that
+        applies to all its tools, or a mapping of tool name to boolean for
+        opting out individual non-idempotent tools. Defaults to True.
+        """
+        cacheable = server_config.get("cacheable", True)
+        if isinstance(cacheable, dict):
+            return bool(cacheable.get(tool_name, True))
+        return bool(cacheable)
+
+    def _cache_get(self, key: tuple[str, str]) -> str | None:
+        """Return a cached result if present and not expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, key: tuple[str, str], value: str):
+        """Store a result, evicting the least recently used entry if full."""
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl, value)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _get_session(
+        self, server_name: str, server_config: Dict[str, Any]
+    ) -> ClientSession:
+        """
+        Return the open session for a server, connecting on first use.
+
+        Concurrent callers share one pending connection rather than racing
+        to open several, and the wait is shielded so a cancelled caller
+        (such as an interrupted prewarm) doesn't abort the connection.
+
+        Args:
+            server_name: Name of the server
+            server_config: Server configuration containing command/args or url
+
+        Returns:
+            An initialized ClientSession for the server
+        """
+        ready = self._sessions.get(server_name)
+        if ready is None:
+            ready = asyncio.get_running_loop().create_future()
+            self._sessions[server_name] = ready
+            self._session_tasks[server_name] = asyncio.create_task(
+                self._run_session(server_name, server_config, ready)
+            )
+        return await asyncio.shield(ready)
+
+    async def _run_session(
+        self,
+        server_name: str,
+        server_config: Dict[str, Any],
+        ready: asyncio.Future,
+    ):
+        """
+        Own a server connection for the lifetime of the executor.
 
+        The MCP transports are anyio context managers that must be exited by
+        the same task that entered them, so each server gets a dedicated task
+        that opens the connection, hands the session back through `ready`,
+        and holds the connection open until aclose() is called. Connecting
+        and the initialize handshake share the server's startup_timeout, so
+        a server that stopped responding fails the call instead of hanging.
+
+        Args:
+            server_name: Name of the server
+            server_config: Server configuration containing command/args or url
+            ready: Future resolved with the initialized session
+        """
+        timeout = get_startup_timeout(self.config, server_config)
         try:
-            url = server_config.get("url")
-            if url:
-                async with streamablehttp_client(url) as (read, write, _):
-                    async with ClientSession(read, write) as session:
-                        return await _call_tool(session)
+            # The deadline wraps the exit stack so an expired handshake
+            # surfaces here as TimeoutError rather than inside the
+            # transport's task group
+            async with asyncio.timeout(timeout) as deadline:
+                async with contextlib.AsyncExitStack() as stack:
+                    session = await self._open_session(stack, server_config)
+                    deadline.reschedule(None)
+                    ready.set_result(session)
+                    await self._closing.wait()
+        except TimeoutError:
+            if not ready.done():
+                ready.set_exception(
+                    TimeoutError(f"Server {server_name} did not start within {timeout}s")
+                )
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(
+                    f"Warning: Session for server {server_name} closed: {e}",
+                    file=sys.stderr,
+                )
+        finally:
+            # Release anyone still waiting if setup was cancelled
+            if not ready.done():
+                ready.cancel()
+            # Drop the dead session so the next call reconnects
+            if self._sessions.get(server_name) is ready:
+                del self._sessions[server_name]
+                del self._session_tasks[server_name]
 
+    @staticmethod
+    async def _open_session(
+        stack: contextlib.AsyncExitStack, server_config: Dict[str, Any]
+    ) -> ClientSession:
+        """
+        Connect to a server and run the MCP initialize handshake.
+
+        Args:
+            stack: Exit stack that owns the transport and session
+            server_config: Server configuration containing command/args or url
+
+        Returns:
+            An initialized ClientSession
+        """
+        url = server_config.get("url")
+        if url:
+            read, write, _ = await stack.enter_async_context(
+                streamablehttp_client(url)
+            )
+        else:
             command = server_config.get("command")
             args = server_config.get("args", [])
             env = server_config.get("env", None)
 
             server_params = StdioServerParameters(command=command, args=args, env=env)
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    return await _call_tool(session)
+            read, write = await stack.enter_async_context(stdio_client(server_params))
 
-        except Exception as e:
-            return json.dumps({"error": str(e)})
+        session = await stack.enter_async_context(ClientSession(read, write))
+        await session.initialize()
+        return session
+
+    async def prewarm(self):
+        """
+        Open sessions to every server that provides tools, in parallel.
+
+        Meant to run in the background while the user types, so the first
+        tool call doesn't pay for the server spawn and handshake. Failures
+        are ignored here; execute_tool will retry and report them.
+        """
+        servers = self.config.get("mcpServers", {})
+        await asyncio.gather(
+            *(
+                self._get_session(server_name, servers[server_name])
+                for server_name in set(self.tool_to_server.values())
+                if server_name in servers
+            ),
+            return_exceptions=True,
+        )
+
+    async def aclose(self):
+        """Close all open MCP server sessions."""
+        self._closing.set()
+        tasks = list(self._session_tasks.items())
+        # A server still in its handshake never sees _closing, so cancel it
+        # rather than waiting out the startup timeout on exit
+        for server_name, task in tasks:
+            if not self._sessions[server_name].done():
+                task.cancel()
+        await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
 
 
 class ChatSession:
     """Manages an interactive chat session with OpenAI and MCP tools."""
 
-    def __init__(self, config_path: str, model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        config_path: str,
+        model: str = "gpt-4o-mini",
+        refresh: bool = False,
+        history_window: int = 20,
+    ):
         """
         Initialize the chat session.
 
         Args:
             config_path: Path to the mcp.json configuration file
             model: OpenAI model to use
+            refresh: Rediscover tools instead of using the cached catalog
+            history_window: Number of recent messages kept verbatim once older
+                history is summarized; must be at least 1
         """
+        if history_window < 1:
+            raise ValueError("history_window must be at least 1")
+
         self.model = model
+        self.refresh = refresh
         self.messages = []
+
+        # Older messages are folded into a running summary so each request
+        # sends at most the summary plus about 2 * history_window messages
+        self.history_window = history_window
+        self.summary: str | None = None
+        self._summarize_task: asyncio.Task | None = None
+
+        # "Calling tool" lines for the current turn, written out in one go
+        # once the turn's tools finish, rather than one print per call
+        self._tool_log = io.StringIO()
         self.tool_executor = MCPToolExecutor(config_path)
         self.tools = None
 
@@ -169,16 +690,25 @@ class ChatSession:
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
 
+        # One pooled HTTP client for the whole session so every completion
+        # reuses a kept-alive connection instead of a fresh TCP/TLS handshake.
+        # DefaultAsyncHttpxClient keeps the SDK's own timeout defaults.
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+
         base_url = os.environ.get("OPENAI_BASE_URL")
         if base_url:
-            self.client = OpenAI(api_key=api_key, base_url=base_url)
+            self.client = AsyncOpenAI(
+                api_key=api_key, base_url=base_url, http_client=http_client
+            )
         else:
-            self.client = OpenAI(api_key=api_key)
+            self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
 
     async def initialize(self):
         """Initialize the chat session by loading MCP tools."""
         print("Initializing MCP tools...")
-        self.tools = await self.tool_executor.initialize_tools()
+        self.tools = await self.tool_executor.initialize_tools(self.refresh)
         print(f"Loaded {len(self.tools)} tools from MCP servers")
         print()
 
@@ -194,72 +724,366 @@ class ChatSession:
         """
         # Add user message to conversation
         self.messages.append({"role": "user", "content": user_message})
+        self._tool_log = io.StringIO()
 
-        # Make initial API call
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=self.messages,
+        # Make initial API call, streaming text to the console and starting
+        # tools as soon as their arguments have fully arrived
+        content, tool_calls, started = await self._stream_completion(
+            messages=self._history(),
             tools=self.tools if self.tools else None,
             tool_choice="auto" if self.tools else None,
         )
 
-        assistant_message = response.choices[0].message
-
         # Check if the assistant wants to call tools
-        if assistant_message.tool_calls:
+        if tool_calls:
             # Add assistant's message with tool calls to conversation
             self.messages.append(
-                {
-                    "role": "assistant",
-                    "content": assistant_message.content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": tc.type,
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments,
-                            },
-                        }
-                        for tc in assistant_message.tool_calls
-                    ],
-                }
+                {"role": "assistant", "content": content, "tool_calls": tool_calls}
             )
 
-            # Execute each tool call
-            for tool_call in assistant_message.tool_calls:
-                tool_name = tool_call.function.name
-                tool_args = json.loads(tool_call.function.arguments)
+            # Tool calls in one assistant turn are independent, so run them
+            # concurrently and fill in each tool message as its result lands.
+            tool_messages = await self._execute_tool_calls(tool_calls, started)
+            self.messages.extend(tool_messages)
+
+            sys.stdout.write(self._tool_log.getvalue())
+            sys.stdout.flush()
+
+            errors = [
+                self.tool_executor.parse_error_result(message["content"])
+                for message in tool_messages
+            ]
+            if all(error and not error["retryable"] for error in errors):
+                # Every tool failed in a way a retry can't fix, so a second
+                # completion could only apologize; answer directly instead
+                content = "Sorry, I couldn't complete that: " + "; ".join(
+                    error["message"] for error in errors
+                )
+                print(f"\nAssistant: {content}")
+            else:
+                # Make second API call with tool results as soon as the last
+                # tool finishes
+                content, _, _ = await self._stream_completion(
+                    messages=self._history()
+                )
+
+        # Add final assistant response to conversation
+        self.messages.append({"role": "assistant", "content": content})
 
-                print(f"Calling tool: {tool_name} with args: {tool_args}")
+        self._maybe_summarize_history()
 
-                # Execute the tool via MCP
-                tool_result = await self.tool_executor.execute_tool(
-                    tool_name, tool_args
-                )
+        return content
+
+    async def batch_run(
+        self, inputs: List[str], latency_budget_ms: int | None = None
+    ) -> List[str | None]:
+        """
+        Run many independent, non-interactive chats through the Batch API.
+
+        Each input is its own conversation and doesn't touch this session's
+        history. Batch requests are billed at a discount but may take up to
+        24 hours; pass a shorter latency_budget_ms to use the real-time
+        endpoint instead.
 
-                # Add tool result to conversation
-                self.messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": tool_result,
-                    }
+        Args:
+            inputs: One user message per chat
+            latency_budget_ms: Optional bound on how long the caller can wait
+
+        Returns:
+            The final assistant content for each input, or None if it failed
+        """
+        # Skip initialize(): its progress lines would land on stdout ahead
+        # of the JSON lines batchwithtools.py prints there
+        if self.tools is None:
+            self.tools = await self.tool_executor.initialize_tools(self.refresh)
+        return await run_batch(
+            self.client,
+            self.model,
+            self.tools,
+            self.tool_executor,
+            inputs,
+            latency_budget_ms,
+        )
+
+    async def aclose(self):
+        """Stop background work and close MCP sessions and the OpenAI client."""
+        if self._summarize_task:
+            self._summarize_task.cancel()
+            # Let it unwind before its client is closed underneath it
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._summarize_task
+        await self.tool_executor.aclose()
+        await self.client.close()
+
+    def _history(self) -> List[Dict[str, Any]]:
+        """Return the messages to send: the running summary plus recent turns."""
+        if not self.summary:
+            return list(self.messages)
+        summary_message = {
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{self.summary}",
+        }
+        return [summary_message] + self.messages
+
+    def _history_boundary(self, keep: int) -> int:
+        """
+        Find where the last `keep` messages start without splitting a tool call.
+
+        A tool result must follow the assistant message that requested it,
+        so the boundary walks backward past any tool messages to include the
+        assistant message with its tool_calls.
+
+        Args:
+            keep: Number of trailing messages to keep
+
+        Returns:
+            Index of the first message to keep
+        """
+        start = max(0, len(self.messages) - keep)
+        while start > 0 and self.messages[start]["role"] == "tool":
+            start -= 1
+        return start
+
+    def _maybe_summarize_history(self):
+        """Start summarizing older messages in the background once history is long."""
+        if len(self.messages) <= 2 * self.history_window:
+            return
+        if self._summarize_task and not self._summarize_task.done():
+            return
+
+        cut = self._history_boundary(self.history_window)
+        if cut == 0:
+            return
+        self._summarize_task = asyncio.create_task(
+            self._compact_history(self.messages[:cut])
+        )
+
+    async def _compact_history(self, older: List[Dict[str, Any]]):
+        """
+        Fold older messages into the running summary and drop them.
+
+        Messages are only ever appended, so the first len(older) entries are
+        still the ones being summarized even if new turns arrive meanwhile.
+
+        Args:
+            older: The oldest messages, ending on a turn boundary
+        """
+        try:
+            self.summary = await self._summarize(older)
+        except Exception as e:
+            # Keep the full history and try again after the next turn
+            print(f"Warning: Could not summarize history: {e}", file=sys.stderr)
+            return
+        del self.messages[: len(older)]
+
+    async def _summarize(self, older: List[Dict[str, Any]]) -> str:
+        """
+        Ask the model to summarize older messages together with any previous summary.
+
+        Args:
+            older: Messages to summarize
+
+        Returns:
+            The updated summary text
+        """
+        lines = []
+        if self.summary:
+            lines.append(f"Earlier summary: {self.summary}")
+        for message in older:
+            for tool_call in message.get("tool_calls") or []:
+                function = tool_call["function"]
+                lines.append(
+                    f"assistant called {function['name']}({function['arguments']})"
                 )
+            if message.get("content"):
+                lines.append(f"{message['role']}: {message['content']}")
 
-            # Make second API call with tool results
-            response = self.client.chat.completions.create(
-                model=self.model, messages=self.messages
-            )
+        response = await self._create_completion(
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "Summarize this conversation for your own later "
+                        "reference. Keep facts, decisions, user preferences "
+                        "and tool results that may matter later. Be concise."
+                    ),
+                },
+                {"role": "user", "content": "\n".join(lines)},
+            ]
+        )
+        return response.choices[0].message.content or ""
 
-            assistant_message = response.choices[0].message
+    async def _create_completion(self, **kwargs) -> Any:
+        """
+        Request a chat completion from OpenAI.
 
-        # Add final assistant response to conversation
-        self.messages.append(
-            {"role": "assistant", "content": assistant_message.content}
+        Args:
+            **kwargs: Extra arguments for chat.completions.create
+
+        Returns:
+            The chat completion response
+        """
+        return await self.client.chat.completions.create(
+            model=self.model, **kwargs
         )
 
-        return assistant_message.content
+    async def _stream_completion(
+        self, **kwargs
+    ) -> tuple[str | None, List[Dict[str, Any]], Dict[str, asyncio.Task]]:
+        """
+        Stream a chat completion, printing text and dispatching tools early.
+
+        Text deltas are printed as they arrive. Tool call deltas are
+        accumulated per index, and each call is started as soon as its
+        arguments parse as a complete JSON object, while the rest of the
+        response is still streaming.
+
+        Args:
+            **kwargs: Extra arguments for chat.completions.create
+
+        Returns:
+            Tuple of the text content (or None), the tool calls in message
+            format, and the tool tasks already started keyed by call id
+        """
+        content_parts = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        started: Dict[str, asyncio.Task] = {}
+
+        stream = await self._create_completion(stream=True, **kwargs)
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+
+                if delta.content:
+                    if not content_parts:
+                        print("\nAssistant: ", end="")
+                    print(delta.content, end="", flush=True)
+                    content_parts.append(delta.content)
+
+                for tc_delta in delta.tool_calls or []:
+                    tool_call = tool_calls.setdefault(
+                        tc_delta.index,
+                        {
+                            "id": None,
+                            "type": "function",
+                            "function": {"name": "", "arguments": ""},
+                        },
+                    )
+                    if tc_delta.id:
+                        tool_call["id"] = tc_delta.id
+                    function = tool_call["function"]
+                    if tc_delta.function and tc_delta.function.name:
+                        function["name"] += tc_delta.function.name
+                    if tc_delta.function and tc_delta.function.arguments:
+                        function["arguments"] += tc_delta.function.arguments
+
+                    call_id = tool_call["id"]
+                    if call_id and call_id not in started:
+                        if self._is_complete_json(function["arguments"]):
+                            started[call_id] = asyncio.create_task(
+                                self._run_tool_call(tool_call)
+                            )
+        except BaseException:
+            # Don't leave tools running if the stream fails part way
+            for task in started.values():
+                task.cancel()
+            raise
+
+        if content_parts:
+            print()
+
+        content = "".join(content_parts) or None
+        return content, [tool_calls[i] for i in sorted(tool_calls)], started
+
+    @staticmethod
+    def _is_complete_json(text: str) -> bool:
+        """Check whether a streamed arguments buffer holds a whole JSON value."""
+        try:
+            orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return False
+        return True
+
+    async def _execute_tool_calls(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        started: Dict[str, asyncio.Task] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run all tool calls from one assistant turn concurrently.
+
+        Tool messages are created up front in tool_calls order, so each
+        tool_call_id lines up with its request, and each message's content
+        is filled in as soon as its tool finishes. The list is therefore
+        ready to send the moment the slowest tool returns.
+
+        Args:
+            tool_calls: Tool calls from the assistant message
+            started: Tasks already dispatched while streaming, keyed by id
+
+        Returns:
+            Tool role messages in the same order as tool_calls
+        """
+        started = started or {}
+        tool_messages = []
+        pending = {}
+        for tool_call in tool_calls:
+            message = {"role": "tool", "tool_call_id": tool_call["id"]}
+            tool_messages.append(message)
+            task = started.get(tool_call["id"]) or asyncio.create_task(
+                self._run_tool_call(tool_call)
+            )
+            pending[task] = message
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    message = pending.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        message["content"] = self.tool_executor.error_result(
+                            "tool_exception",
+                            str(error) or type(error).__name__,
+                            retryable=True,
+                        )
+                    else:
+                        message["content"] = task.result()
+        finally:
+            # Don't leave tools running if the turn is cancelled
+            for task in pending:
+                task.cancel()
+
+        return tool_messages
+
+    async def _run_tool_call(self, tool_call: Dict[str, Any]) -> str:
+        """
+        Parse a single tool call from the model and execute it via MCP.
+
+        Args:
+            tool_call: A tool call from the assistant message
+
+        Returns:
+            Result of the tool execution as a string
+        """
+        tool_name = tool_call["function"]["name"]
+        try:
+            tool_args = self.tool_executor.parse_arguments(
+                tool_call["function"]["arguments"]
+            )
+        except json.JSONDecodeError as e:
+            # The model can fix malformed arguments on another try
+            return self.tool_executor.error_result(
+                "invalid_arguments", str(e), retryable=True
+            )
+
+        self._tool_log.write(f"Calling tool: {tool_name} with args: {tool_args}\n")
+
+        return await self.tool_executor.execute_tool(tool_name, tool_args)
 
     @staticmethod
     def _print_table_divider(col_widths: tuple, char: str = "-"):
@@ -348,44 +1172,56 @@ class ChatSession:
         print("=" * 60)
         print()
 
-        while True:
-            try:
-                # Get user input
-                user_input = input("You: ").strip()
+        # Connect to the MCP servers while the user types the first message
+        prewarm_task = asyncio.create_task(self.tool_executor.prewarm())
 
-                if not user_input:
-                    continue
+        try:
+            while True:
+                try:
+                    # Read input without blocking the event loop, so
+                    # background tasks keep running between prompts
+                    user_input = (await aioconsole.ainput("You: ")).strip()
 
-                if user_input.startswith("/"):
-                    self.handle_slash_command(user_input)
-                    continue
+                    if not user_input:
+                        continue
+
+                    if user_input.startswith("/"):
+                        self.handle_slash_command(user_input)
+                        continue
 
-                # Send message and get response
-                response = await self.send_message(user_input)
+                    # Send message; the response is printed as it streams
+                    await self.send_message(user_input)
+                    print()
 
-                print(f"\nAssistant: {response}")
-                print()
+                except (KeyboardInterrupt, EOFError, asyncio.CancelledError):
+                    # Ctrl+C arrives as cancellation while awaiting input
+                    print("\nGoodbye!")
+                    break
+                except Exception as e:
+                    print(f"Error: {e}", file=sys.stderr)
+                    print()
 
-            except (KeyboardInterrupt, EOFError):
-                print("\nGoodbye!")
-                break
-            except Exception as e:
-                print(f"Error: {e}", file=sys.stderr)
-                print()
+        finally:
+            prewarm_task.cancel()
+            await self.aclose()
 
 
 async def main():
     """Main entry point for the chat program."""
-    if len(sys.argv) < 2:
-        print("Usage: python chatwithtools.py <path_to_mcp.json> [model]")
+    args = [arg for arg in sys.argv[1:] if arg != "--refresh"]
+    refresh = len(args) != len(sys.argv) - 1
+
+    if len(args) < 1:
+        print("Usage: python chatwithtools.py <path_to_mcp.json> [model] [--refresh]")
         print("  model: Optional OpenAI model (default: gpt-4o-mini)")
+        print("  --refresh: Rediscover MCP tools instead of using the cache")
         sys.exit(1)
 
-    config_path = sys.argv[1]
-    model = sys.argv[2] if len(sys.argv) > 2 else "gpt-4o"
+    config_path = args[0]
+    model = args[1] if len(args) > 1 else "gpt-4o"
 
     try:
-        chat = ChatSession(config_path, model)
+        chat = ChatSession(config_path, model, refresh)
         await chat.run()
 
     except FileNotFoundError as e:
@@ -11,10 +11,17 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 import aiofiles
+import orjson
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
 
+# Upper bound on MCP servers started concurrently during tool discovery
+MAX_CONCURRENT_SERVERS = 8
+
+# Seconds to wait for a server to start and list its tools
+DEFAULT_STARTUP_TIMEOUT = 10
+
 
 async def get_tools_from_server(
     server_name: str, server_config: Dict[str, Any]
@@ -69,24 +76,44 @@ async def get_tools_from_server(
         return {"server": server_name, "error": str(e)}
 
 
-async def get_tools(config_path: str) -> List[Dict[str, Any]]:
+def get_startup_timeout(
+    config: Dict[str, Any], server_config: Dict[str, Any]
+) -> float:
+    """
+    Return how long to wait for a server to start and complete its handshake.
+
+    A per-server "startup_timeout" overrides the top-level one in mcp.json.
+
+    Args:
+        config: Parsed mcp.json configuration
+        server_config: Configuration of the server being started
+
+    Returns:
+        Timeout in seconds
+    """
+    default_timeout = config.get("startup_timeout", DEFAULT_STARTUP_TIMEOUT)
+    return server_config.get("startup_timeout", default_timeout)
+
+
+async def get_tools(config: Dict[str, Any] | str) -> List[Dict[str, Any]]:
     """
     Load MCP configuration and retrieve tools from all configured servers.
 
     Args:
-        config_path: Path to the mcp.json configuration file
+        config: Parsed mcp.json configuration, or a path to the file
 
     Returns:
         List of dictionaries containing server information and their tools
     """
-    # Load configuration file
-    config_file = Path(config_path)
-    if not config_file.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    # Load configuration file when given a path; callers that already
+    # parsed it (like MCPToolExecutor) pass the dict to avoid a second read
+    if isinstance(config, str):
+        config_file = Path(config)
+        if not config_file.exists():
+            raise FileNotFoundError(f"Configuration file not found: {config}")
 
-    async with aiofiles.open(config_file, "r") as f:
-        content = await f.read()
-        config = json.loads(content)
+        async with aiofiles.open(config_file, "rb") as f:
+            config = orjson.loads(await f.read())
 
     # Get mcpServers configuration
     mcp_servers = config.get("mcpServers", {})
@@ -94,10 +121,26 @@ async def get_tools(config_path: str) -> List[Dict[str, Any]]:
     if not mcp_servers:
         return [{"error": "No mcpServers found in configuration"}]
 
+    # Bound how many server processes start at once so large configs don't
+    # spawn every subprocess simultaneously
+    semaphore = asyncio.Semaphore(min(MAX_CONCURRENT_SERVERS, len(mcp_servers)))
+
+    async def _run(server_name: str, server_config: Dict[str, Any]):
+        # One slow or hung server can't stall the whole startup
+        timeout = get_startup_timeout(config, server_config)
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    get_tools_from_server(server_name, server_config),
+                    timeout=timeout,
+                )
+            except TimeoutError:
+                return {"server": server_name, "error": "timeout"}
+
     # Process each server
     tasks = []
     for server_name, server_config in mcp_servers.items():
-        tasks.append(get_tools_from_server(server_name, server_config))
+        tasks.append(_run(server_name, server_config))
 
     # Execute all tasks concurrently
     results = await asyncio.gather(*tasks)
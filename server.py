@@ -1,3 +1,4 @@
+import operator
 import os
 from typing import Optional
 import httpx
@@ -9,6 +10,14 @@ mcp = FastMCP("Weather Service")
 # Get the weather API base URL from environment variable
 WEATHER_BASE_URL = os.getenv("WEATHER_BASE_URL")
 
+# Calculator operators supported by the calculate tool
+_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
 
 # Tool implementation
 @mcp.tool()
@@ -139,19 +148,14 @@ def get_forecast(
 @mcp.tool()
 def calculate(operator: str, argument1: str, argument2: str) -> str:
     """Provide a basic four function calculator that can add, subtract, multiply or divide two numeric arguments"""
+    fn = _OPERATORS.get(operator)
+    if fn is None:
+        return f"Error: unknown operator {operator!r}, expected one of + - * /"
     try:
-        arg1 = float(argument1)
-        arg2 = float(argument2)
-        if operator == "+":
-            return str(arg1 + arg2)
-        elif operator == "-":
-            return str(arg1 - arg2)
-        elif operator == "*":
-            return str(arg1 * arg2)
-        elif operator == "/":
-            return str(arg1 / arg2)
+        return str(fn(float(argument1), float(argument2)))
     except Exception as err:
-        return err
+        # Always return a string so the tool result stays serializable
+        return f"Error: {err}"
 
 
 # Resource implementation
@@ -0,0 +1,143 @@
+import contextlib
+import io
+import json
+import unittest
+from types import SimpleNamespace
+
+import orjson
+
+import batchwithtools
+
+
+def _output_line(custom_id, message):
+    return orjson.dumps(
+        {
+            "custom_id": custom_id,
+            "response": {
+                "status_code": 200,
+                "body": {"choices": [{"message": message}]},
+            },
+        }
+    ).decode()
+
+
+def _error_line(custom_id, message):
+    return orjson.dumps(
+        {
+            "custom_id": custom_id,
+            "response": None,
+            "error": {"code": "server_error", "message": message},
+        }
+    ).decode()
+
+
+class FakeFiles:
+    def __init__(self):
+        self.contents = {}
+
+    async def create(self, file, purpose):
+        return SimpleNamespace(id=f"file-{len(self.contents)}")
+
+    async def content(self, file_id):
+        return SimpleNamespace(text=self.contents[file_id])
+
+
+class FakeBatches:
+    """Completes each batch immediately with the next scripted round."""
+
+    def __init__(self, files, rounds):
+        self.files = files
+        self.rounds = list(rounds)
+
+    async def create(self, input_file_id, endpoint, completion_window):
+        round_ = self.rounds.pop(0)
+        if isinstance(round_, Exception):
+            raise round_
+        status, output, errors = round_
+        batch_id = f"batch-{len(self.rounds)}"
+        output_file_id = error_file_id = None
+        if output:
+            output_file_id = f"{batch_id}-output"
+            self.files.contents[output_file_id] = "\n".join(output)
+        if errors:
+            error_file_id = f"{batch_id}-errors"
+            self.files.contents[error_file_id] = "\n".join(errors)
+        return SimpleNamespace(
+            id=batch_id,
+            status=status,
+            errors=None,
+            output_file_id=output_file_id,
+            error_file_id=error_file_id,
+            request_counts=None,
+        )
+
+
+class FakeToolExecutor:
+    parse_arguments = staticmethod(json.loads)
+
+    async def execute_tool(self, tool_name, arguments):
+        return "42"
+
+
+def _fake_client(rounds):
+    files = FakeFiles()
+    return SimpleNamespace(files=files, batches=FakeBatches(files, rounds))
+
+
+TOOL_CALL_MESSAGE = {
+    "role": "assistant",
+    "content": None,
+    "tool_calls": [
+        {
+            "id": "call-1",
+            "type": "function",
+            "function": {"name": "calculate", "arguments": "{}"},
+        }
+    ],
+}
+
+FIRST_ROUND = (
+    "completed",
+    [
+        _output_line("req-0", TOOL_CALL_MESSAGE),
+        _output_line("req-1", {"role": "assistant", "content": "B"}),
+        _output_line("req-2", {"role": "assistant", "content": "C"}),
+    ],
+    [],
+)
+
+
+class RunBatchTest(unittest.IsolatedAsyncioTestCase):
+    async def _run(self, rounds):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            results = await batchwithtools.run_batch(
+                _fake_client(rounds),
+                "gpt-4o",
+                [],
+                FakeToolExecutor(),
+                ["a", "b", "c"],
+            )
+        return results, stderr.getvalue()
+
+    async def test_failed_round_keeps_earlier_answers(self):
+        results, stderr = await self._run(
+            [FIRST_ROUND, ("failed", [], [_error_line("req-0", "boom")])]
+        )
+
+        self.assertEqual(results, [None, "B", "C"])
+        self.assertIn("Batch batch-0 failed", stderr)
+        self.assertIn("Request req-0 failed", stderr)
+        self.assertIn("boom", stderr)
+
+    async def test_round_that_raises_keeps_earlier_answers(self):
+        results, stderr = await self._run(
+            [FIRST_ROUND, RuntimeError("upload rejected")]
+        )
+
+        self.assertEqual(results, [None, "B", "C"])
+        self.assertIn("Round 2 failed for 1 chats: upload rejected", stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
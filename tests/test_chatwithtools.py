@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+
+import orjson
+
+from chatwithtools import MCPToolExecutor
+
+# An MCP server that exits shortly after answering its first call
+FLAKY_SERVER = textwrap.dedent(
+    """
+    import os
+    import threading
+
+    from mcp.server.fastmcp import FastMCP
+
+    mcp = FastMCP("Flaky")
+
+
+    @mcp.tool()
+    def ping() -> str:
+        threading.Timer(0.2, os._exit, args=(0,)).start()
+        return f"pong from {os.getpid()}"
+
+
+    mcp.run()
+    """
+)
+
+
+class MCPToolExecutorTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        server_path = os.path.join(tmp.name, "flaky.py")
+        with open(server_path, "w") as f:
+            f.write(FLAKY_SERVER)
+        self.config_path = os.path.join(tmp.name, "mcp.json")
+        with open(self.config_path, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    {
+                        "mcpServers": {
+                            "flaky": {
+                                "command": sys.executable,
+                                "args": [server_path],
+                                "cacheable": False,
+                            }
+                        }
+                    }
+                )
+            )
+
+    async def test_reconnects_after_server_exits(self):
+        executor = MCPToolExecutor(self.config_path)
+        executor.tool_to_server["ping"] = "flaky"
+        try:
+            first = await executor.execute_tool("ping", {})
+            # Let the server exit before the next call
+            await asyncio.sleep(1)
+            second = await executor.execute_tool("ping", {})
+        finally:
+            await executor.aclose()
+
+        self.assertTrue(first.startswith("pong from "), first)
+        self.assertTrue(second.startswith("pong from "), second)
+        self.assertNotEqual(first, second)
+
+    def test_parse_arguments_keeps_large_integers(self):
+        arguments = MCPToolExecutor.parse_arguments(
+            '{"a": 123456789012345678901234567890}'
+        )
+
+        self.assertEqual(arguments, {"a": 123456789012345678901234567890})
+        self.assertEqual(
+            MCPToolExecutor._arguments_key(arguments),
+            '{"a":123456789012345678901234567890}',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()